@@ -0,0 +1,20 @@
+"""Jittered exponential backoff shared by the auth and API retry loops."""
+
+import random
+import time
+
+
+def sleep_backoff(
+    attempt: int,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+) -> None:
+    """Sleep for ``base * 2**attempt`` seconds, capped, plus random jitter.
+
+    The jitter de-synchronizes retries across exporter instances hitting
+    the same upstream so transient failures don't turn into a thundering
+    herd of simultaneous retries.
+    """
+    delay = min(base * (2**attempt), cap)
+    time.sleep(delay * (1.0 + random.uniform(0.0, jitter)))
@@ -2,7 +2,44 @@ import os
 from dataclasses import dataclass
 
 
-@dataclass
+def _as_bool(value: str) -> bool:
+    return value.lower() in ("true", "1", "yes")
+
+
+# (field_name, default, caster) — env var name is the field name uppercased;
+# a None default marks the variable as required. Defaults are stored already
+# typed so they are never round-tripped through the caster.
+_FIELDS = (
+    ("tesla_client_id", None, str),
+    ("tesla_client_secret", None, str),
+    ("tesla_redirect_uri", "https://localhost/callback", str),
+    ("tesla_api_base", "https://fleet-api.prd.na.vn.cloud.tesla.com", str),
+    ("tesla_auth_base", "https://auth.tesla.com", str),
+    ("tesla_token_base", "https://fleet-auth.prd.vn.cloud.tesla.com", str),
+    (
+        "tesla_scopes",
+        "openid offline_access vehicle_device_data vehicle_location",
+        str,
+    ),
+    ("tesla_vehicle_index", 0, int),
+    ("poll_interval_seconds", 300, int),
+    ("sleep_poll_interval_seconds", 660, int),
+    ("wake_on_poll", False, _as_bool),
+    ("exporter_port", 9090, int),
+    ("token_file_path", "/data/tokens/token.json", str),
+    ("log_level", "INFO", str),
+)
+
+
+def _get(name, default, caster):
+    key = name.upper()
+    if default is None:
+        return caster(os.environ[key])
+    raw = os.environ.get(key)
+    return default if raw is None else caster(raw)
+
+
+@dataclass(slots=True)
 class Config:
     # Tesla API credentials
     tesla_client_id: str
@@ -27,38 +64,5 @@ class Config:
     @classmethod
     def from_env(cls) -> "Config":
         return cls(
-            tesla_client_id=os.environ["TESLA_CLIENT_ID"],
-            tesla_client_secret=os.environ["TESLA_CLIENT_SECRET"],
-            tesla_redirect_uri=os.environ.get(
-                "TESLA_REDIRECT_URI", "https://localhost/callback"
-            ),
-            tesla_api_base=os.environ.get(
-                "TESLA_API_BASE",
-                "https://fleet-api.prd.na.vn.cloud.tesla.com",
-            ),
-            tesla_auth_base=os.environ.get(
-                "TESLA_AUTH_BASE", "https://auth.tesla.com"
-            ),
-            tesla_token_base=os.environ.get(
-                "TESLA_TOKEN_BASE",
-                "https://fleet-auth.prd.vn.cloud.tesla.com",
-            ),
-            tesla_scopes=os.environ.get(
-                "TESLA_SCOPES",
-                "openid offline_access vehicle_device_data vehicle_location",
-            ),
-            tesla_vehicle_index=int(os.environ.get("TESLA_VEHICLE_INDEX", "0")),
-            poll_interval_seconds=int(
-                os.environ.get("POLL_INTERVAL_SECONDS", "300")
-            ),
-            sleep_poll_interval_seconds=int(
-                os.environ.get("SLEEP_POLL_INTERVAL_SECONDS", "660")
-            ),
-            wake_on_poll=os.environ.get("WAKE_ON_POLL", "false").lower()
-            in ("true", "1", "yes"),
-            exporter_port=int(os.environ.get("EXPORTER_PORT", "9090")),
-            token_file_path=os.environ.get(
-                "TOKEN_FILE_PATH", "/data/tokens/token.json"
-            ),
-            log_level=os.environ.get("LOG_LEVEL", "INFO"),
+            **{name: _get(name, default, caster) for name, default, caster in _FIELDS}
         )
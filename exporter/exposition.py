@@ -0,0 +1,87 @@
+"""Cached Prometheus exposition server.
+
+The collector only changes when the polling loop feeds it new data
+(every poll_interval_seconds at most), but Prometheus typically scrapes
+every ~15s, so the vast majority of scrapes would re-serialize identical
+bytes. This server caches the encoded vehicle metrics keyed on the
+collector's data version and replays them until the data actually
+changes; the default process/platform/GC collectors are cheap and change
+every scrape, so they are rendered fresh and appended.
+"""
+
+import gzip
+import logging
+import threading
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from prometheus_client import REGISTRY, generate_latest
+from prometheus_client.core import CollectorRegistry
+from prometheus_client.exposition import CONTENT_TYPE_LATEST
+
+from metrics import TeslaCollector
+
+logger = logging.getLogger(__name__)
+
+
+class _SilentHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        """Don't log every scrape to stderr."""
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class CachedMetricsApp:
+    """WSGI app that re-encodes vehicle metrics only when they changed."""
+
+    def __init__(self, collector: TeslaCollector, registry=REGISTRY):
+        self._collector = collector
+        # The Tesla collector gets its own registry so its (large, slow
+        # to serialize) output can be cached independently of the default
+        # process/platform/GC collectors, which must stay live
+        self._tesla_registry = CollectorRegistry()
+        self._tesla_registry.register(collector)
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._cached_version = -1
+        self._cached_body = b""
+
+    def __call__(self, environ, start_response):
+        version = self._collector.data_version
+        gzip_ok = "gzip" in environ.get("HTTP_ACCEPT_ENCODING", "")
+
+        with self._lock:
+            if version != self._cached_version:
+                self._cached_body = generate_latest(self._tesla_registry)
+                self._cached_version = version
+            tesla_body = self._cached_body
+
+        body = tesla_body + generate_latest(self._registry)
+        if gzip_ok:
+            # Cheap level: scrape cadence dominates, not compression ratio
+            body = gzip.compress(body, compresslevel=1)
+
+        headers = [("Content-Type", CONTENT_TYPE_LATEST)]
+        if gzip_ok:
+            headers.append(("Content-Encoding", "gzip"))
+        headers.append(("Content-Length", str(len(body))))
+        start_response("200 OK", headers)
+        return [body]
+
+
+def start_cached_http_server(
+    port: int, collector: TeslaCollector, registry=REGISTRY
+) -> None:
+    """Serve cached metrics on a daemon thread (start_http_server stand-in)."""
+    app = CachedMetricsApp(collector, registry)
+    httpd = make_server(
+        "0.0.0.0",
+        port,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=_SilentHandler,
+    )
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
@@ -6,14 +6,14 @@ on an HTTP endpoint for Prometheus to scrape.
 """
 
 import logging
+import os
+import selectors
 import signal
 import sys
-import threading
-
-from prometheus_client import REGISTRY
-from prometheus_client.exposition import start_http_server
+import time
 
 from config import Config
+from exposition import start_cached_http_server
 from metrics import TeslaCollector
 from sleep_tracker import SleepTracker
 from tesla_auth import TeslaAuth
@@ -52,23 +52,37 @@ def main() -> None:
     tracker = SleepTracker(config)
     collector = TeslaCollector()
 
-    # Register the custom collector (unregister defaults we don't need)
-    REGISTRY.register(collector)
-
-    # Start Prometheus HTTP server
-    start_http_server(config.exporter_port)
+    # Start Prometheus HTTP server (cached between data updates)
+    start_cached_http_server(config.exporter_port, collector)
     logger.info("Prometheus metrics server started on port %d", config.exporter_port)
 
-    # Graceful shutdown
-    stop_event = threading.Event()
+    # Graceful shutdown: the kernel writes to a self-pipe on signal
+    # delivery (set_wakeup_fd), so even a 660s sleep ends immediately
+    stop = False
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+
+    selector = selectors.DefaultSelector()
+    selector.register(wake_r, selectors.EVENT_READ)
 
     def shutdown_handler(signum, frame):
+        nonlocal stop
         logger.info("Received signal %d, shutting down...", signum)
-        stop_event.set()
+        stop = True
 
     signal.signal(signal.SIGTERM, shutdown_handler)
     signal.signal(signal.SIGINT, shutdown_handler)
 
+    def wait_for_stop(timeout: float) -> None:
+        # Returns early when a signal lands a wakeup byte on the pipe
+        for key, _ in selector.select(timeout):
+            try:
+                os.read(key.fd, 4096)
+            except (BlockingIOError, InterruptedError):
+                pass
+
     # Resolve target vehicle
     vehicle_id = None
     vehicle_name = "unknown"
@@ -81,7 +95,12 @@ def main() -> None:
         config.wake_on_poll,
     )
 
-    while not stop_event.is_set():
+    # Schedule polls against a monotonic deadline so time spent in API
+    # calls does not drift the cadence or hammer the API back-to-back.
+    deadline = time.monotonic()
+
+    while not stop:
+        now = time.monotonic()
         try:
             # List vehicles to get state (lightweight call, does not wake)
             vehicles = client.list_vehicles()
@@ -104,12 +123,17 @@ def main() -> None:
                         if not client.wake_vehicle(vehicle_id):
                             collector.update(None, current_state, vehicle_name)
                             tracker.record_error()
-                            wait_interval = tracker.get_poll_interval()
-                            stop_event.wait(wait_interval)
+                            deadline = max(now, deadline) + tracker.get_poll_interval()
+                            wait_for_stop(max(0.0, deadline - time.monotonic()))
                             continue
 
-                    # Fetch vehicle data
-                    data = client.get_vehicle_data(vehicle_id)
+                    # Fetch vehicle data, asking only for the sections the
+                    # collector consumes so one request returns everything
+                    data = client.get_vehicle_data(
+                        vehicle_id,
+                        endpoints="charge_state;climate_state;drive_state;"
+                        "vehicle_state;location_data",
+                    )
                     if data is not None:
                         collector.update(data, current_state, vehicle_name)
                         tracker.record_successful_fetch()
@@ -118,17 +142,19 @@ def main() -> None:
                             vehicle_name,
                             current_state,
                         )
-                        # Debug: log drive_state keys to diagnose location
-                        drive_state = data.get("drive_state", {})
-                        logger.debug(
-                            "drive_state keys: %s",
-                            list(drive_state.keys()) if drive_state else "empty",
-                        )
-                        logger.debug(
-                            "drive_state latitude=%r longitude=%r",
-                            drive_state.get("latitude"),
-                            drive_state.get("longitude"),
-                        )
+                        # Debug: log drive_state keys to diagnose location.
+                        # Gated so the key list is never built under INFO.
+                        if logger.isEnabledFor(logging.DEBUG):
+                            drive_state = data.get("drive_state", {})
+                            logger.debug(
+                                "drive_state keys: %s",
+                                list(drive_state.keys()) if drive_state else "empty",
+                            )
+                            logger.debug(
+                                "drive_state latitude=%r longitude=%r",
+                                drive_state.get("latitude"),
+                                drive_state.get("longitude"),
+                            )
                     else:
                         collector.update(None, current_state, vehicle_name)
                         collector.record_error("vehicle_data_failed")
@@ -144,10 +170,13 @@ def main() -> None:
             tracker.record_error()
 
         # Wait for next poll cycle
-        wait_interval = tracker.get_poll_interval()
-        logger.debug("Next poll in %ds", wait_interval)
-        stop_event.wait(wait_interval)
+        deadline = max(now, deadline) + tracker.get_poll_interval()
+        wait_interval = max(0.0, deadline - time.monotonic())
+        logger.debug("Next poll in %.1fs", wait_interval)
+        wait_for_stop(wait_interval)
 
+    signal.set_wakeup_fd(-1)
+    selector.close()
     logger.info("Exporter shut down cleanly")
 
 
@@ -1,7 +1,12 @@
+import functools
 import logging
 import time
 
-from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    StateSetMetricFamily,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,17 +32,161 @@ TIRES = ("front_left", "front_right", "rear_left", "rear_right")
 # Seat heater labels
 SEATS = ("front_left", "front_right")
 
+# Label lists are shared by every family instead of being rebuilt per call
+VEHICLE_LABELS = ["vehicle_name"]
+DOOR_LABELS = ["vehicle_name", "door"]
+TRUNK_LABELS = ["vehicle_name", "trunk"]
+TIRE_LABELS = ["vehicle_name", "tire"]
+SEAT_LABELS = ["vehicle_name", "seat"]
+
+# Exporter label -> Tesla API key, for the labeled composite families
+DOOR_MAP = {
+    "driver_front": "df",
+    "driver_rear": "dr",
+    "passenger_front": "pf",
+    "passenger_rear": "pr",
+}
+TRUNK_MAP = {"front": "ft", "rear": "rt"}
+TPMS_MAP = {
+    "front_left": "tpms_pressure_fl",
+    "front_right": "tpms_pressure_fr",
+    "rear_left": "tpms_pressure_rl",
+    "rear_right": "tpms_pressure_rr",
+}
+SEAT_MAP = {
+    "front_left": "seat_heater_left",
+    "front_right": "seat_heater_right",
+}
+
+
+# Memoized: odometer/range values repeat verbatim across scrapes while
+# the car is parked, so repeat conversions become a dict lookup
+@functools.lru_cache(maxsize=128)
+def _miles_to_km_slow(value) -> float | None:
+    try:
+        return float(value) * MILES_TO_KM
+    except (ValueError, TypeError):
+        return None
+
+
+def _miles_to_km(value) -> float | None:
+    # Fast path: API values are almost always already int/float
+    if isinstance(value, (int, float)):
+        return value * MILES_TO_KM
+    if value is None:
+        return None
+    try:
+        return _miles_to_km_slow(value)
+    except TypeError:
+        # Unhashable garbage (list/dict) trips the cache before the
+        # converter's own guard can; skip the sample like any bad value
+        return None
+
+
+# Covers the common bool/int/None inputs with one dict lookup
+_BOOL_MAP = {None: None, False: 0.0, True: 1.0, 0: 0.0, 1: 1.0}
+
+
+def _bool(value) -> float | None:
+    if value is None or isinstance(value, (bool, int)):
+        return _BOOL_MAP.get(value, 1.0)
+    return 1.0 if value else 0.0
+
+
+# Static (metric_name, doc, section, api_key, transform) templates, built
+# once at import time so collect() never re-creates name/help/label
+# arguments per scrape: the code stays a single loop over this table.
+_METRIC_SPECS = (
+    # charge_state
+    ("tesla_battery_level_percent", "Battery level 0-100", "charge_state", "battery_level", None),
+    ("tesla_battery_usable_level_percent", "Usable battery level 0-100", "charge_state", "usable_battery_level", None),
+    ("tesla_battery_range_km", "Rated range in km", "charge_state", "battery_range", _miles_to_km),
+    ("tesla_battery_ideal_range_km", "Ideal range in km", "charge_state", "ideal_battery_range", _miles_to_km),
+    ("tesla_battery_estimated_range_km", "Estimated range in km", "charge_state", "est_battery_range", _miles_to_km),
+    ("tesla_charge_limit_percent", "Charge limit SOC", "charge_state", "charge_limit_soc", None),
+    ("tesla_charge_energy_added_kwh", "Energy added in session (kWh)", "charge_state", "charge_energy_added", None),
+    ("tesla_charge_rate_kmh", "Charge rate (km/h)", "charge_state", "charge_rate", _miles_to_km),
+    ("tesla_charger_power_kw", "Charger power (kW)", "charge_state", "charger_power", None),
+    ("tesla_charger_voltage_volts", "Charger voltage", "charge_state", "charger_voltage", None),
+    ("tesla_charger_actual_current_amps", "Charger current (amps)", "charge_state", "charger_actual_current", None),
+    ("tesla_charge_time_remaining_hours", "Time to full charge (hours)", "charge_state", "time_to_full_charge", None),
+    ("tesla_charge_port_door_open", "Charge port door open", "charge_state", "charge_port_door_open", _bool),
+    ("tesla_battery_heater_on", "Battery heater active", "charge_state", "battery_heater_on", _bool),
+    ("tesla_scheduled_charging_pending", "Scheduled charge pending", "charge_state", "scheduled_charging_pending", _bool),
+    # climate_state
+    ("tesla_inside_temperature_celsius", "Interior temperature", "climate_state", "inside_temp", None),
+    ("tesla_outside_temperature_celsius", "Exterior temperature", "climate_state", "outside_temp", None),
+    ("tesla_driver_temperature_setting_celsius", "Driver temp setting", "climate_state", "driver_temp_setting", None),
+    ("tesla_passenger_temperature_setting_celsius", "Passenger temp setting", "climate_state", "passenger_temp_setting", None),
+    ("tesla_climate_on", "HVAC on", "climate_state", "is_climate_on", _bool),
+    ("tesla_preconditioning", "Preconditioning active", "climate_state", "is_preconditioning", _bool),
+    ("tesla_fan_status", "Fan speed level", "climate_state", "fan_status", None),
+    ("tesla_defrost_mode", "Defrost mode", "climate_state", "defrost_mode", None),
+    # drive_state
+    ("tesla_latitude", "GPS latitude", "drive_state", "latitude", None),
+    ("tesla_longitude", "GPS longitude", "drive_state", "longitude", None),
+    ("tesla_heading_degrees", "Heading 0-360", "drive_state", "heading", None),
+    ("tesla_power_watts", "Drive power draw", "drive_state", "power", None),
+    # vehicle_state
+    ("tesla_odometer_km", "Odometer reading in km", "vehicle_state", "odometer", _miles_to_km),
+    ("tesla_locked", "Vehicle locked", "vehicle_state", "locked", _bool),
+    ("tesla_sentry_mode", "Sentry mode active", "vehicle_state", "sentry_mode", _bool),
+    ("tesla_valet_mode", "Valet mode active", "vehicle_state", "valet_mode", _bool),
+    ("tesla_user_present", "User present in vehicle", "vehicle_state", "is_user_present", _bool),
+    ("tesla_remote_start", "Remote start active", "vehicle_state", "remote_start", _bool),
+    ("tesla_center_display_state", "Center display state", "vehicle_state", "center_display_state", None),
+)
+
+_SECTIONS = ("charge_state", "climate_state", "drive_state", "vehicle_state")
+
 
 class TeslaCollector:
     """Custom Prometheus collector that serves cached Tesla vehicle data."""
 
+    __slots__ = (
+        "_snapshot",
+        "_data_version",
+        "_cached_doors",
+        "_cached_trunks",
+        "_cached_tpms",
+        "_poll_errors",
+        "_name_labels",
+        "_door_labels",
+        "_trunk_labels",
+        "_tire_labels",
+        "_seat_labels",
+    )
+
     def __init__(self):
-        self._vehicle_data: dict | None = None
-        self._vehicle_state: str = "unknown"
-        self._vehicle_name: str = "unknown"
-        self._last_successful_poll: float = 0.0
-        self._api_reachable: bool = False
+        # One immutable (vehicle_data, state, name, last_poll, reachable)
+        # tuple, swapped atomically so collect() on the scrape thread never
+        # observes torn state without needing a lock
+        self._snapshot: tuple = (None, "unknown", "unknown", 0.0, False)
+        # Bumped whenever the exposed metrics can have changed (fresh
+        # payload, state/name transition, reachability flip, new error);
+        # lets scrape-side caches skip re-encoding identical output
+        self._data_version: int = 0
+        self._cached_doors: GaugeMetricFamily | None = None
+        self._cached_trunks: GaugeMetricFamily | None = None
+        self._cached_tpms: GaugeMetricFamily | None = None
         self._poll_errors: dict[str, int] = {}
+        self._rebuild_label_cache("unknown")
+
+    def _rebuild_label_cache(self, vehicle_name: str) -> None:
+        """Precompute the label-value lists add_metric needs.
+
+        The vehicle name almost never changes, so building these once per
+        name change saves ~50 list allocations per scrape.
+        """
+        self._name_labels = [vehicle_name]
+        self._door_labels = {d: [vehicle_name, d] for d in DOORS}
+        self._trunk_labels = {t: [vehicle_name, t] for t in TRUNKS}
+        self._tire_labels = {t: [vehicle_name, t] for t in TIRES}
+        self._seat_labels = {s: [vehicle_name, s] for s in SEATS}
+
+    @property
+    def data_version(self) -> int:
+        return self._data_version
 
     def update(
         self,
@@ -45,213 +194,202 @@ class TeslaCollector:
         vehicle_state: str,
         vehicle_name: str,
     ) -> None:
-        self._vehicle_state = vehicle_state
-        self._vehicle_name = vehicle_name
-        self._api_reachable = True
+        data, prev_state, prev_name, last_poll, prev_reachable = self._snapshot
+        if vehicle_name != prev_name:
+            self._rebuild_label_cache(vehicle_name)
 
         if vehicle_data is not None:
-            self._vehicle_data = vehicle_data
-            self._last_successful_poll = time.time()
+            data = vehicle_data
+            last_poll = time.time()
+            self._rebuild_vehicle_composites(vehicle_data.get("vehicle_state") or {})
+
+        if (
+            vehicle_data is not None
+            or vehicle_state != prev_state
+            or vehicle_name != prev_name
+            or not prev_reachable
+        ):
+            self._data_version += 1
+
+        # Single pointer store publishes the whole snapshot atomically
+        self._snapshot = (data, vehicle_state, vehicle_name, last_poll, True)
+
+    def _rebuild_vehicle_composites(self, vs: dict) -> None:
+        """Precompute the doors/trunks/tpms families for the new payload.
+
+        While the car is asleep, scrapes far outnumber data updates, so
+        these families are shared across scrapes instead of being rebuilt
+        (prometheus_client does not mutate yielded families).
+        """
+        doors_g = GaugeMetricFamily(
+            "tesla_door_open",
+            "Door open (1=open, 0=closed)",
+            labels=DOOR_LABELS,
+        )
+        for door_label, api_key in DOOR_MAP.items():
+            val = vs.get(api_key)
+            if val is not None:
+                doors_g.add_metric(self._door_labels[door_label], float(val))
+        self._cached_doors = doors_g if doors_g.samples else None
+
+        trunks_g = GaugeMetricFamily(
+            "tesla_trunk_open",
+            "Trunk open (1=open, 0=closed)",
+            labels=TRUNK_LABELS,
+        )
+        for trunk_label, api_key in TRUNK_MAP.items():
+            val = vs.get(api_key)
+            if val is not None:
+                trunks_g.add_metric(self._trunk_labels[trunk_label], float(val))
+        self._cached_trunks = trunks_g if trunks_g.samples else None
+
+        tpms_g = GaugeMetricFamily(
+            "tesla_tpms_pressure_bar",
+            "Tire pressure in bar",
+            labels=TIRE_LABELS,
+        )
+        for tire_label, api_key in TPMS_MAP.items():
+            val = vs.get(api_key)
+            if val is not None:
+                tpms_g.add_metric(self._tire_labels[tire_label], float(val))
+        self._cached_tpms = tpms_g if tpms_g.samples else None
 
     def record_error(self, error_type: str) -> None:
         self._poll_errors[error_type] = self._poll_errors.get(error_type, 0) + 1
+        self._data_version += 1
 
     def mark_api_unreachable(self) -> None:
-        self._api_reachable = False
+        data, state, name, last_poll, reachable = self._snapshot
+        if reachable:
+            self._data_version += 1
+        self._snapshot = (data, state, name, last_poll, False)
 
     def collect(self):
-        name = self._vehicle_name
+        data, state, name, last_successful_poll, api_reachable = self._snapshot
+        name_labels = self._name_labels
 
         # --- Exporter health metrics ---
         up = GaugeMetricFamily(
             "tesla_exporter_up",
             "Whether the exporter can reach the Tesla API",
-            labels=["vehicle_name"],
+            labels=VEHICLE_LABELS,
         )
-        up.add_metric([name], 1.0 if self._api_reachable else 0.0)
+        up.add_metric(name_labels, 1.0 if api_reachable else 0.0)
         yield up
 
         reachable = GaugeMetricFamily(
             "tesla_exporter_vehicle_reachable",
             "Whether the vehicle is online",
-            labels=["vehicle_name"],
+            labels=VEHICLE_LABELS,
         )
         reachable.add_metric(
-            [name], 1.0 if self._vehicle_state == "online" else 0.0
+            name_labels, 1.0 if state == "online" else 0.0
         )
         yield reachable
 
-        last_poll = GaugeMetricFamily(
-            "tesla_exporter_last_successful_poll_timestamp_seconds",
-            "Unix timestamp of last successful vehicle_data fetch",
-            labels=["vehicle_name"],
-        )
-        if self._last_successful_poll > 0:
-            last_poll.add_metric([name], self._last_successful_poll)
-        yield last_poll
-
-        errors = CounterMetricFamily(
-            "tesla_exporter_poll_errors_total",
-            "Count of polling errors by type",
-            labels=["vehicle_name", "error_type"],
-        )
-        for err_type, count in self._poll_errors.items():
-            errors.add_metric([name, err_type], count)
-        yield errors
+        # Empty families only cost exposition bytes — skip them entirely
+        if last_successful_poll > 0:
+            last_poll = GaugeMetricFamily(
+                "tesla_exporter_last_successful_poll_timestamp_seconds",
+                "Unix timestamp of last successful vehicle_data fetch",
+                labels=VEHICLE_LABELS,
+            )
+            last_poll.add_metric(name_labels, last_successful_poll)
+            yield last_poll
+
+        poll_errors = dict(self._poll_errors)
+        if poll_errors:
+            errors = CounterMetricFamily(
+                "tesla_exporter_poll_errors_total",
+                "Count of polling errors by type",
+                labels=["vehicle_name", "error_type"],
+            )
+            for err_type, count in poll_errors.items():
+                errors.add_metric([name, err_type], count)
+            yield errors
 
         # If we have no vehicle data yet, stop here
-        if self._vehicle_data is None:
+        if data is None:
             return
 
-        data = self._vehicle_data
-
-        # --- Battery / Charge metrics (converted to km) ---
-        charge = data.get("charge_state", {})
+        # Resolve each vehicle_data section once, then emit every plain
+        # gauge with a single pass over the static spec table
+        sections = {s: data.get(s) or {} for s in _SECTIONS}
+        gauge = self._gauge
+        for metric_name, doc, section, api_key, transform in _METRIC_SPECS:
+            value = sections[section].get(api_key)
+            if transform is not None:
+                value = transform(value)
+            g = gauge(metric_name, doc, name_labels, value)
+            if g is not None:
+                yield g
+
+        # --- Battery / Charge composites ---
+        charge = sections["charge_state"]
         if charge:
-            yield self._gauge("tesla_battery_level_percent", "Battery level 0-100", name, charge.get("battery_level"))
-            yield self._gauge("tesla_battery_usable_level_percent", "Usable battery level 0-100", name, charge.get("usable_battery_level"))
-            yield self._gauge("tesla_battery_range_km", "Rated range in km", name, self._miles_to_km(charge.get("battery_range")))
-            yield self._gauge("tesla_battery_ideal_range_km", "Ideal range in km", name, self._miles_to_km(charge.get("ideal_battery_range")))
-            yield self._gauge("tesla_battery_estimated_range_km", "Estimated range in km", name, self._miles_to_km(charge.get("est_battery_range")))
-            yield self._gauge("tesla_charge_limit_percent", "Charge limit SOC", name, charge.get("charge_limit_soc"))
-            yield self._gauge("tesla_charge_energy_added_kwh", "Energy added in session (kWh)", name, charge.get("charge_energy_added"))
-            yield self._gauge("tesla_charge_rate_kmh", "Charge rate (km/h)", name, self._miles_to_km(charge.get("charge_rate")))
-            yield self._gauge("tesla_charger_power_kw", "Charger power (kW)", name, charge.get("charger_power"))
-            yield self._gauge("tesla_charger_voltage_volts", "Charger voltage", name, charge.get("charger_voltage"))
-            yield self._gauge("tesla_charger_actual_current_amps", "Charger current (amps)", name, charge.get("charger_actual_current"))
-            yield self._gauge("tesla_charge_time_remaining_hours", "Time to full charge (hours)", name, charge.get("time_to_full_charge"))
-            yield self._gauge("tesla_charge_port_door_open", "Charge port door open", name, self._bool(charge.get("charge_port_door_open")))
-            yield self._gauge("tesla_battery_heater_on", "Battery heater active", name, self._bool(charge.get("battery_heater_on")))
-            yield self._gauge("tesla_scheduled_charging_pending", "Scheduled charge pending", name, self._bool(charge.get("scheduled_charging_pending")))
-
-            # Charging state as labeled gauge
-            cs = GaugeMetricFamily(
+            # Charging state as a stateset (one sample line per state)
+            cs = StateSetMetricFamily(
                 "tesla_charging_state",
                 "Charging state (1 for active state)",
-                labels=["vehicle_name", "state"],
+                labels=VEHICLE_LABELS,
             )
             current_charging = charge.get("charging_state", "")
-            for s in CHARGING_STATES:
-                cs.add_metric([name, s], 1.0 if s == current_charging else 0.0)
+            cs.add_metric(
+                name_labels, {s: s == current_charging for s in CHARGING_STATES}
+            )
             yield cs
 
-        # --- Climate metrics ---
-        climate = data.get("climate_state", {})
+        # --- Climate composites ---
+        climate = sections["climate_state"]
         if climate:
-            yield self._gauge("tesla_inside_temperature_celsius", "Interior temperature", name, climate.get("inside_temp"))
-            yield self._gauge("tesla_outside_temperature_celsius", "Exterior temperature", name, climate.get("outside_temp"))
-            yield self._gauge("tesla_driver_temperature_setting_celsius", "Driver temp setting", name, climate.get("driver_temp_setting"))
-            yield self._gauge("tesla_passenger_temperature_setting_celsius", "Passenger temp setting", name, climate.get("passenger_temp_setting"))
-            yield self._gauge("tesla_climate_on", "HVAC on", name, self._bool(climate.get("is_climate_on")))
-            yield self._gauge("tesla_preconditioning", "Preconditioning active", name, self._bool(climate.get("is_preconditioning")))
-            yield self._gauge("tesla_fan_status", "Fan speed level", name, climate.get("fan_status"))
-            yield self._gauge("tesla_defrost_mode", "Defrost mode", name, climate.get("defrost_mode"))
-
             # Seat heaters
             sh = GaugeMetricFamily(
                 "tesla_seat_heater_level",
                 "Seat heater level",
-                labels=["vehicle_name", "seat"],
+                labels=SEAT_LABELS,
             )
-            seat_map = {
-                "front_left": "seat_heater_left",
-                "front_right": "seat_heater_right",
-            }
-            for seat_label, api_key in seat_map.items():
+            for seat_label, api_key in SEAT_MAP.items():
                 val = climate.get(api_key)
                 if val is not None:
-                    sh.add_metric([name, seat_label], float(val))
-            yield sh
+                    sh.add_metric(self._seat_labels[seat_label], float(val))
+            if sh.samples:
+                yield sh
 
-        # --- Drive state metrics (speed converted to km/h) ---
-        drive = data.get("drive_state", {})
+        # --- Drive state composites (speed converted to km/h) ---
+        drive = sections["drive_state"]
         if drive:
-            # Log drive_state for debugging location
-            logger.debug("drive_state contents: %s", drive)
-
-            # Location — try multiple possible key names
-            lat = drive.get("latitude") or drive.get("active_route_latitude")
-            lon = drive.get("longitude") or drive.get("active_route_longitude")
-            yield self._gauge("tesla_latitude", "GPS latitude", name, lat)
-            yield self._gauge("tesla_longitude", "GPS longitude", name, lon)
-            yield self._gauge("tesla_heading_degrees", "Heading 0-360", name, drive.get("heading"))
+            # Log drive_state for debugging location (gated so the dict
+            # repr is never built under INFO and above)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("drive_state contents: %s", drive)
 
             # Speed: API returns mph (or None when parked)
             speed_mph = drive.get("speed")
             speed_kmh = float(speed_mph) * MPH_TO_KMH if speed_mph is not None else 0.0
-            yield self._gauge("tesla_speed_kmh", "Speed in km/h", name, speed_kmh)
-            yield self._gauge("tesla_power_watts", "Drive power draw", name, drive.get("power"))
+            g = gauge("tesla_speed_kmh", "Speed in km/h", name_labels, speed_kmh)
+            if g is not None:
+                yield g
 
-            # Shift state as labeled gauge
-            ss = GaugeMetricFamily(
+            # Shift state as a stateset (one sample line per state)
+            ss = StateSetMetricFamily(
                 "tesla_shift_state",
                 "Shift state (1 for active state)",
-                labels=["vehicle_name", "state"],
+                labels=VEHICLE_LABELS,
             )
             current_shift = drive.get("shift_state") or "P"
-            for s in SHIFT_STATES:
-                ss.add_metric([name, s], 1.0 if s == current_shift else 0.0)
+            ss.add_metric(name_labels, {s: s == current_shift for s in SHIFT_STATES})
             yield ss
 
-        # --- Vehicle state metrics (odometer converted to km) ---
-        vs = data.get("vehicle_state", {})
+        # --- Vehicle state composites ---
+        vs = sections["vehicle_state"]
         if vs:
-            yield self._gauge("tesla_odometer_km", "Odometer reading in km", name, self._miles_to_km(vs.get("odometer")))
-            yield self._gauge("tesla_locked", "Vehicle locked", name, self._bool(vs.get("locked")))
-            yield self._gauge("tesla_sentry_mode", "Sentry mode active", name, self._bool(vs.get("sentry_mode")))
-            yield self._gauge("tesla_valet_mode", "Valet mode active", name, self._bool(vs.get("valet_mode")))
-            yield self._gauge("tesla_user_present", "User present in vehicle", name, self._bool(vs.get("is_user_present")))
-            yield self._gauge("tesla_remote_start", "Remote start active", name, self._bool(vs.get("remote_start")))
-            yield self._gauge("tesla_center_display_state", "Center display state", name, vs.get("center_display_state"))
-
-            # Doors
-            doors_g = GaugeMetricFamily(
-                "tesla_door_open",
-                "Door open (1=open, 0=closed)",
-                labels=["vehicle_name", "door"],
-            )
-            door_map = {
-                "driver_front": "df",
-                "driver_rear": "dr",
-                "passenger_front": "pf",
-                "passenger_rear": "pr",
-            }
-            for door_label, api_key in door_map.items():
-                val = vs.get(api_key)
-                if val is not None:
-                    doors_g.add_metric([name, door_label], float(val))
-            yield doors_g
-
-            # Trunks
-            trunks_g = GaugeMetricFamily(
-                "tesla_trunk_open",
-                "Trunk open (1=open, 0=closed)",
-                labels=["vehicle_name", "trunk"],
-            )
-            trunk_map = {"front": "ft", "rear": "rt"}
-            for trunk_label, api_key in trunk_map.items():
-                val = vs.get(api_key)
-                if val is not None:
-                    trunks_g.add_metric([name, trunk_label], float(val))
-            yield trunks_g
-
-            # Tire pressure (already in bar — metric system)
-            tpms_g = GaugeMetricFamily(
-                "tesla_tpms_pressure_bar",
-                "Tire pressure in bar",
-                labels=["vehicle_name", "tire"],
-            )
-            tpms_map = {
-                "front_left": "tpms_pressure_fl",
-                "front_right": "tpms_pressure_fr",
-                "rear_left": "tpms_pressure_rl",
-                "rear_right": "tpms_pressure_rr",
-            }
-            for tire_label, api_key in tpms_map.items():
-                val = vs.get(api_key)
-                if val is not None:
-                    tpms_g.add_metric([name, tire_label], float(val))
-            yield tpms_g
+            # Doors/trunks/tire pressure, prebuilt on the last data update
+            if self._cached_doors is not None:
+                yield self._cached_doors
+            if self._cached_trunks is not None:
+                yield self._cached_trunks
+            if self._cached_tpms is not None:
+                yield self._cached_tpms
 
             # Software version info metric
             version = vs.get("car_version", "unknown")
@@ -264,26 +402,18 @@ class TeslaCollector:
             yield sv
 
     @staticmethod
-    def _gauge(metric_name: str, doc: str, vehicle_name: str, value) -> GaugeMetricFamily:
-        g = GaugeMetricFamily(metric_name, doc, labels=["vehicle_name"])
-        if value is not None:
+    def _gauge(
+        metric_name: str, doc: str, name_labels: list, value
+    ) -> GaugeMetricFamily | None:
+        # Fast path: API values are almost always already int/float
+        if not isinstance(value, (int, float)):
+            if value is None:
+                return None
             try:
-                g.add_metric([vehicle_name], float(value))
+                value = float(value)
             except (ValueError, TypeError):
                 logger.debug("Cannot convert %s=%r to float", metric_name, value)
+                return None
+        g = GaugeMetricFamily(metric_name, doc, labels=VEHICLE_LABELS)
+        g.add_metric(name_labels, value)
         return g
-
-    @staticmethod
-    def _bool(value) -> float | None:
-        if value is None:
-            return None
-        return 1.0 if value else 0.0
-
-    @staticmethod
-    def _miles_to_km(value) -> float | None:
-        if value is None:
-            return None
-        try:
-            return float(value) * MILES_TO_KM
-        except (ValueError, TypeError):
-            return None
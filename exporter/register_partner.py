@@ -14,6 +14,10 @@ import requests
 
 from config import Config
 
+# One shared session so back-to-back Tesla calls reuse the TLS connection
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "tesla-prometheus-exporter/1.0"})
+
 
 def main() -> None:
     try:
@@ -41,7 +45,7 @@ def main() -> None:
     }
 
     try:
-        resp = requests.post(token_url, json=token_payload, timeout=30)
+        resp = SESSION.post(token_url, json=token_payload, timeout=30)
         if resp.status_code != 200:
             print(f"Failed to get partner token: {resp.status_code}")
             print(resp.text)
@@ -60,7 +64,7 @@ def main() -> None:
     register_payload = {"domain": config.tesla_redirect_uri.split("//")[1].split("/")[0]}
 
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             register_url, json=register_payload, headers=headers, timeout=30
         )
         print(f"  Response: {resp.status_code}")
@@ -10,9 +10,24 @@ Usage:
 import sys
 from urllib.parse import parse_qs, urlparse
 
+import requests
+
 from config import Config
 from tesla_auth import TeslaAuth
 
+try:  # 2-5x faster JSON handling when available
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    import json
+
+    _loads = json.loads
+
+# One shared session so back-to-back Tesla calls reuse the TLS connection
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "tesla-prometheus-exporter/1.0"})
+
 
 def main() -> None:
     try:
@@ -80,17 +95,15 @@ def main() -> None:
     print("Verifying access by listing your vehicles...")
     print()
 
-    import requests
-
     headers = {"Authorization": f"Bearer {auth.access_token}"}
-    resp = requests.get(
+    resp = SESSION.get(
         f"{config.tesla_api_base}/api/1/vehicles",
         headers=headers,
         timeout=30,
     )
 
     if resp.status_code == 200:
-        vehicles = resp.json().get("response", [])
+        vehicles = _loads(resp.content).get("response", [])
         if vehicles:
             print(f"Found {len(vehicles)} vehicle(s):")
             for i, v in enumerate(vehicles):
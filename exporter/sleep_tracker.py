@@ -12,6 +12,18 @@ class SleepTracker:
         self._last_known_state: str = "unknown"
         self._last_data_fetch: float = 0.0
         self._consecutive_errors: int = 0
+        # state -> poll interval, resolved once so the hot loop does a
+        # single dict lookup instead of a chain of comparisons
+        self._interval_by_state = {
+            "asleep": config.sleep_poll_interval_seconds,
+            "offline": config.sleep_poll_interval_seconds,
+            "unknown": config.sleep_poll_interval_seconds,
+        }
+        self._default_interval = config.poll_interval_seconds
+        self._error_interval = max(
+            config.poll_interval_seconds,
+            config.sleep_poll_interval_seconds,
+        )
 
     @property
     def last_known_state(self) -> str:
@@ -60,12 +72,8 @@ class SleepTracker:
     def get_poll_interval(self) -> int:
         # After many consecutive errors, slow down
         if self._consecutive_errors >= 5:
-            return max(
-                self._config.poll_interval_seconds,
-                self._config.sleep_poll_interval_seconds,
-            )
-
-        if self._last_known_state in ("asleep", "offline", "unknown"):
-            return self._config.sleep_poll_interval_seconds
+            return self._error_interval
 
-        return self._config.poll_interval_seconds
+        return self._interval_by_state.get(
+            self._last_known_state, self._default_interval
+        )
@@ -1,22 +1,101 @@
+import errno
+import hashlib
 import json
 import logging
 import os
 import secrets
 import tempfile
+import threading
 import time
 from urllib.parse import urlencode
 
 import requests
 
+from backoff import sleep_backoff
 from config import Config
 
+try:  # 2-5x faster JSON handling when available
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+
 logger = logging.getLogger(__name__)
 
 
+def _trunc(resp: requests.Response) -> str:
+    # resp.text decodes the whole body (with charset detection) just to
+    # throw away everything past the log snippet; slice the bytes first
+    return resp.content[:200].decode("utf-8", "replace")
+
+
+class WriteCorruptionError(OSError):
+    """Token-file read-back did not match the bytes that were written."""
+
+
 class TeslaAuth:
     def __init__(self, config: Config):
         self._config = config
         self._token_data: dict | None = None
+        self._token_file_mtime_ns: int = 0
+        # Pre-formatted Authorization header plus its expiry, so the
+        # per-request path is one attribute load and one time comparison
+        self._auth_header: str | None = None
+        self._expires_at: float = 0.0
+        # Bumped whenever the cached header changes, so callers can keep
+        # a prebuilt headers dict and only rewrite Authorization on change
+        self.token_version: int = 0
+        # Serializes refreshes: Tesla refresh tokens are single-use, so
+        # two concurrent refreshes would invalidate each other
+        self._refresh_lock = threading.Lock()
+        # Long-lived session so token refreshes reuse the pooled TLS
+        # connection to the auth host instead of re-handshaking
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "tesla-prometheus-exporter/1.0"
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=2, pool_maxsize=4, max_retries=0
+        )
+        self._session.mount("https://", adapter)
+        # Both the refresh and code-exchange flows post here
+        self._token_url = f"{config.tesla_token_base}/oauth2/v3/token"
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _cache_auth_header(self) -> None:
+        token = (self._token_data or {}).get("access_token")
+        if token:
+            self._auth_header = f"Bearer {token}"
+            self._expires_at = self._token_data.get("expires_at", 0)
+        else:
+            self._auth_header = None
+            self._expires_at = 0.0
+        self.token_version += 1
+
+    def get_auth_header(self) -> str | None:
+        """Return the cached ``Bearer ...`` header, refreshing if stale."""
+        if self._auth_header is not None and time.time() < self._expires_at - 300:
+            return self._auth_header
+        self.refresh_access_token()
+        return self._auth_header
+
+    def invalidate(self) -> None:
+        """Drop the cached header so the next request re-derives it."""
+        self._auth_header = None
+        self._expires_at = 0.0
+        self.token_version += 1
 
     @property
     def access_token(self) -> str | None:
@@ -26,8 +105,22 @@ class TeslaAuth:
             self.refresh_access_token()
         return self._token_data.get("access_token") if self._token_data else None
 
+    def maybe_reload(self) -> None:
+        """Pick up a token written by another process (e.g. setup_token).
+
+        A cheap stat against the cached mtime; load_token only runs when
+        the file actually changed on disk.
+        """
+        try:
+            mtime_ns = os.stat(self._config.token_file_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns != self._token_file_mtime_ns:
+            self.load_token()
+
     @property
     def is_token_valid(self) -> bool:
+        self.maybe_reload()
         if self._token_data is None:
             return False
         expires_at = self._token_data.get("expires_at", 0)
@@ -36,29 +129,89 @@ class TeslaAuth:
 
     def load_token(self) -> bool:
         path = self._config.token_file_path
-        if not os.path.exists(path):
+        # Raw os.open/os.read: one open syscall covers the existence
+        # check, the fstat for the mtime cache and the read, without the
+        # buffered-IO layer a few-hundred-byte token file doesn't need
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except FileNotFoundError:
             logger.warning("Token file not found at %s", path)
             return False
+
         try:
-            with open(path) as f:
-                self._token_data = json.load(f)
+            mtime_ns = os.fstat(fd).st_mtime_ns
+            # Skip re-parsing if the file has not changed since last load
+            if self._token_data is not None and mtime_ns == self._token_file_mtime_ns:
+                return True
+
+            chunks = []
+            while chunk := os.read(fd, 8192):
+                chunks.append(chunk)
+            self._token_data = _loads(b"".join(chunks))
+            self._token_file_mtime_ns = mtime_ns
+            self._cache_auth_header()
             logger.info("Loaded token from %s", path)
             return True
-        except (json.JSONDecodeError, OSError) as e:
+        except (ValueError, OSError) as e:
             logger.error("Failed to load token file: %s", e)
             return False
+        finally:
+            os.close(fd)
 
     def save_token(self, token_data: dict) -> None:
         path = self._config.token_file_path
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        # Atomic write: write to temp file then rename
-        dir_name = os.path.dirname(path)
+        # Resolve symlinks so the temp file lands on the same filesystem
+        # as the real target — os.replace across devices raises EXDEV
+        dir_name = os.path.dirname(os.path.realpath(path))
+        os.makedirs(dir_name, exist_ok=True)
+
+        # Serialize once so the bytes on disk can be verified against
+        # exactly what we intended to write
+        payload = _dumps(token_data)
+        expected_sha = hashlib.sha256(payload).hexdigest()
+
+        # Atomic write: exclusive temp file (mkstemp uses O_EXCL), fsync,
+        # read-back verification, then rename
         try:
-            fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
-            with os.fdopen(fd, "w") as f:
-                json.dump(token_data, f, indent=2)
-            os.replace(tmp_path, path)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=dir_name,
+                prefix=os.path.basename(path) + ".",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                # fsync before rename: losing the refresh token to a crash
+                # bricks the exporter for ~24h
+                f.flush()
+                os.fsync(f.fileno())
+
+            # A silent disk error here would otherwise only surface at the
+            # next restart, when load_token fails and the exporter dies
+            with open(tmp_path, "rb") as f:
+                actual_sha = hashlib.sha256(f.read()).hexdigest()
+            if actual_sha != expected_sha:
+                os.unlink(tmp_path)
+                raise WriteCorruptionError(
+                    f"token read-back mismatch for {path}: "
+                    f"expected sha256 {expected_sha}, got {actual_sha}"
+                )
+
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.critical(
+                    "Atomic rename %s -> %s failed (errno=%s %s)",
+                    tmp_path,
+                    path,
+                    e.errno,
+                    errno.errorcode.get(e.errno, "?"),
+                )
+                raise
+            self._fsync_dir(dir_name)
             self._token_data = token_data
+            self._token_file_mtime_ns = os.stat(path).st_mtime_ns
+            self._cache_auth_header()
+            self._append_journal(path, expected_sha, len(payload))
             logger.info("Token saved to %s", path)
         except OSError as e:
             logger.critical("Failed to save token file: %s", e)
@@ -69,12 +222,49 @@ class TeslaAuth:
                 pass
             raise
 
+    @staticmethod
+    def _append_journal(path: str, sha256_hex: str, nbytes: int) -> None:
+        # Append-only log of successful writes, for post-mortem debugging
+        entry = json.dumps(
+            {"ts": time.time(), "path": path, "sha256": sha256_hex, "bytes": nbytes}
+        )
+        try:
+            with open(path + ".journal.jsonl", "a") as f:
+                f.write(entry + "\n")
+        except OSError as e:
+            logger.warning("Could not append token write journal: %s", e)
+
+    @staticmethod
+    def _fsync_dir(dir_name: str) -> None:
+        # Persist the rename itself; directory fsync is unsupported on
+        # some platforms (e.g. Windows), where losing it is acceptable
+        try:
+            dir_fd = os.open(dir_name, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
     def refresh_access_token(self) -> None:
+        with self._refresh_lock:
+            self._refresh_access_token_locked()
+
+    def _refresh_access_token_locked(self) -> None:
+        # Another thread (or process, via maybe_reload) may have finished
+        # a refresh while we waited on the lock. The header check matters:
+        # invalidate() clears only the cached header, so after a 401 the
+        # locally-unexpired _token_data must not short-circuit the refresh
+        if self.is_token_valid and self._auth_header is not None:
+            return
+
         if self._token_data is None or "refresh_token" not in self._token_data:
             logger.error("No refresh token available")
             return
 
-        url = f"{self._config.tesla_token_base}/oauth2/v3/token"
         payload = {
             "grant_type": "refresh_token",
             "client_id": self._config.tesla_client_id,
@@ -82,11 +272,10 @@ class TeslaAuth:
             "refresh_token": self._token_data["refresh_token"],
         }
 
-        backoff = 1
         max_retries = 5
         for attempt in range(max_retries):
             try:
-                resp = requests.post(url, json=payload, timeout=30)
+                resp = self._session.post(self._token_url, json=payload, timeout=30)
                 if resp.status_code == 200:
                     data = resp.json()
                     token_data = {
@@ -100,14 +289,27 @@ class TeslaAuth:
                     self.save_token(token_data)
                     logger.info("Token refreshed successfully")
                     return
-                else:
-                    logger.warning(
-                        "Token refresh failed (attempt %d/%d): %d %s",
-                        attempt + 1,
-                        max_retries,
+
+                if resp.status_code in (400, 401, 403):
+                    # Unrecoverable: a rejected refresh token (invalid_grant)
+                    # or bad client credentials will never succeed on retry
+                    logger.critical(
+                        "Token refresh rejected (%d): %s. "
+                        "Re-run setup_token.py to obtain a new token.",
                         resp.status_code,
-                        resp.text[:200],
+                        _trunc(resp),
                     )
+                    self._token_data = None
+                    self._cache_auth_header()
+                    return
+
+                logger.warning(
+                    "Token refresh failed (attempt %d/%d): %d %s",
+                    attempt + 1,
+                    max_retries,
+                    resp.status_code,
+                    _trunc(resp),
+                )
             except requests.RequestException as e:
                 logger.warning(
                     "Token refresh request failed (attempt %d/%d): %s",
@@ -117,8 +319,7 @@ class TeslaAuth:
                 )
 
             if attempt < max_retries - 1:
-                time.sleep(min(backoff, 60))
-                backoff *= 2
+                sleep_backoff(attempt)
 
         logger.critical(
             "Token refresh failed after %d attempts. "
@@ -126,6 +327,7 @@ class TeslaAuth:
             max_retries,
         )
         self._token_data = None
+        self._cache_auth_header()
 
     def get_authorization_url(self) -> tuple[str, str]:
         state = secrets.token_urlsafe(32)
@@ -140,7 +342,6 @@ class TeslaAuth:
         return url, state
 
     def exchange_code(self, code: str) -> dict:
-        url = f"{self._config.tesla_token_base}/oauth2/v3/token"
         payload = {
             "grant_type": "authorization_code",
             "client_id": self._config.tesla_client_id,
@@ -149,7 +350,7 @@ class TeslaAuth:
             "audience": self._config.tesla_api_base,
             "redirect_uri": self._config.tesla_redirect_uri,
         }
-        resp = requests.post(url, json=payload, timeout=30)
+        resp = self._session.post(self._token_url, json=payload, timeout=30)
         resp.raise_for_status()
         data = resp.json()
 
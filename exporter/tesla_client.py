@@ -1,33 +1,121 @@
+import functools
+import json
 import logging
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
 
 import requests
 
+try:  # 2-5x faster JSON decoding of the large vehicle_data payloads
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
+from backoff import sleep_backoff
 from config import Config
-from tesla_auth import TeslaAuth
+from tesla_auth import TeslaAuth, _trunc
 
 logger = logging.getLogger(__name__)
 
+# Default vehicle_data query, built once and shared read-only across
+# polls instead of re-concatenated and re-allocated per request.
+# Includes location_data (required for latitude/longitude on 2023.38+).
+_VEHICLE_DATA_PARAMS = MappingProxyType(
+    {
+        "endpoints": "charge_state;climate_state;drive_state;"
+        "location_data;vehicle_state;vehicle_config"
+    }
+)
+
+
+def _parse_retry_after(value: str) -> float:
+    """Parse Retry-After as delta-seconds or HTTP-date, clamped to 0-300s.
+
+    A bare int() would raise on the HTTP-date form and collapse the retry
+    into the exception path, and an absurd server value must not stall
+    the scraper for hours.
+    """
+    try:
+        parsed = float(value)
+    except (TypeError, ValueError):
+        try:
+            dt = parsedate_to_datetime(value)
+            parsed = (dt - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            parsed = 30.0
+    return min(max(parsed, 0.0), 300.0)
+
+
+@functools.lru_cache(maxsize=8)
+def _vehicle_data_path(vehicle_id: int) -> str:
+    # One f-string per vehicle per process lifetime instead of per poll
+    return f"/api/1/vehicles/{vehicle_id}/vehicle_data"
+
 
 class TeslaClient:
     def __init__(self, config: Config, auth: TeslaAuth):
         self._config = config
         self._auth = auth
+        # Normalized once so _request is a single concatenation
+        self._api_base = config.tesla_api_base.rstrip("/")
         self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip",
+                "User-Agent": "tesla-prometheus-exporter/1.0",
+            }
+        )
+        # Sized for the polling loop plus a burst of wake_vehicle checks;
+        # max_retries=0 because _request owns the retry policy
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=32, max_retries=0
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # ETag -> parsed body per (url, params), so conditional GETs can
+        # skip re-downloading and re-parsing unchanged responses (the
+        # vehicle list barely changes across wake_vehicle polls)
+        self._etag_cache: dict[tuple, tuple[str, dict]] = {}
 
     def _request(self, method: str, path: str, **kwargs) -> dict | None:
-        url = f"{self._config.tesla_api_base}{path}"
+        url = self._api_base + path
         max_retries = 3
-        backoff = 1
 
-        for attempt in range(max_retries):
-            token = self._auth.access_token
-            if token is None:
-                logger.error("No valid access token available")
-                return None
+        cache_key = cached = None
+        if method == "GET":
+            params = kwargs.get("params")
+            cache_key = (url, tuple(sorted(params.items())) if params else None)
+            cached = self._etag_cache.get(cache_key)
+
+        # Build the headers dict once; only Authorization is rewritten,
+        # and only when the token actually changed (e.g. 401 -> refresh)
+        headers = dict(kwargs.pop("headers", {}))
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        # Fail fast before the retry loop: without a token there is
+        # nothing to retry, and the refresh path does its own backoff
+        auth_header = self._auth.get_auth_header()
+        if auth_header is None:
+            logger.error("No valid access token available")
+            return None
+        headers["Authorization"] = auth_header
+        auth_version = self._auth.token_version
 
-            headers = kwargs.pop("headers", {})
-            headers["Authorization"] = f"Bearer {token}"
+        for attempt in range(max_retries):
+            # Re-derive the header only after a 401 invalidated it
+            if auth_version != self._auth.token_version:
+                auth_header = self._auth.get_auth_header()
+                auth_version = self._auth.token_version
+                if auth_header is None:
+                    logger.error("No valid access token available")
+                    return None
+                headers["Authorization"] = auth_header
 
             try:
                 resp = self._session.request(
@@ -35,11 +123,20 @@ class TeslaClient:
                 )
 
                 if resp.status_code == 200:
-                    return resp.json()
+                    # Decode from raw bytes: skips requests' charset
+                    # detection and, with orjson, the slower stdlib parser
+                    result = _loads(resp.content)
+                    etag = resp.headers.get("ETag")
+                    if etag and cache_key is not None:
+                        self._etag_cache[cache_key] = (etag, result)
+                    return result
+
+                if resp.status_code == 304 and cached is not None:
+                    return cached[1]
 
                 if resp.status_code == 401 and attempt == 0:
-                    logger.warning("Got 401, refreshing token and retrying")
-                    self._auth.refresh_access_token()
+                    logger.warning("Got 401, invalidating cached token and retrying")
+                    self._auth.invalidate()
                     continue
 
                 if resp.status_code == 408:
@@ -47,8 +144,10 @@ class TeslaClient:
                     return None
 
                 if resp.status_code == 429:
-                    retry_after = int(resp.headers.get("Retry-After", 30))
-                    logger.warning("Rate limited, sleeping %ds", retry_after)
+                    retry_after = _parse_retry_after(
+                        resp.headers.get("Retry-After", "30")
+                    )
+                    logger.warning("Rate limited, sleeping %.0fs", retry_after)
                     time.sleep(retry_after)
                     continue
 
@@ -58,16 +157,15 @@ class TeslaClient:
                         resp.status_code,
                         attempt + 1,
                         max_retries,
-                        resp.text[:200],
+                        _trunc(resp),
                     )
                     if attempt < max_retries - 1:
-                        time.sleep(min(backoff, 60))
-                        backoff *= 2
+                        sleep_backoff(attempt)
                     continue
 
                 # Other 4xx
                 logger.error(
-                    "API error %d: %s", resp.status_code, resp.text[:200]
+                    "API error %d: %s", resp.status_code, _trunc(resp)
                 )
                 return None
 
@@ -79,8 +177,7 @@ class TeslaClient:
                     e,
                 )
                 if attempt < max_retries - 1:
-                    time.sleep(min(backoff, 60))
-                    backoff *= 2
+                    sleep_backoff(attempt)
 
         logger.error("All %d request attempts failed for %s", max_retries, path)
         return None
@@ -91,42 +188,44 @@ class TeslaClient:
             return []
         return result.get("response", [])
 
-    def get_vehicle_data(self, vehicle_id: int) -> dict | None:
-        # Request all data categories explicitly, including location_data
-        endpoints = (
-            "charge_state;"
-            "climate_state;"
-            "drive_state;"
-            "location_data;"
-            "vehicle_state;"
-            "vehicle_config"
-        )
+    def get_vehicle(self, vehicle_id: int) -> dict | None:
+        result = self._request("GET", f"/api/1/vehicles/{vehicle_id}")
+        if result is None:
+            return None
+        return result.get("response")
+
+    def get_vehicle_data(
+        self, vehicle_id: int, endpoints: str | None = None
+    ) -> dict | None:
+        if endpoints is None:
+            params = _VEHICLE_DATA_PARAMS
+        else:
+            params = {"endpoints": endpoints}
         result = self._request(
-            "GET",
-            f"/api/1/vehicles/{vehicle_id}/vehicle_data",
-            params={"endpoints": endpoints},
+            "GET", _vehicle_data_path(vehicle_id), params=params
         )
         if result is None:
             return None
         return result.get("response")
 
+    # Typical wakes take 10-20s: check sooner early to return control
+    # fast, back off later to waste fewer calls if the car stays offline
+    _WAKE_DELAYS = (2, 3, 4, 6, 8, 12, 15, 20)
+
     def wake_vehicle(self, vehicle_id: int) -> bool:
         logger.info("Sending wake command to vehicle %d", vehicle_id)
         self._request("POST", f"/api/1/vehicles/{vehicle_id}/wake_up")
 
-        # Poll until online or timeout
-        max_wait = 60
-        interval = 5
+        # Poll until online or the ~60s schedule is exhausted, using the
+        # single-vehicle endpoint instead of the full list
         elapsed = 0
-
-        while elapsed < max_wait:
-            time.sleep(interval)
-            elapsed += interval
-            vehicles = self.list_vehicles()
-            for v in vehicles:
-                if v.get("id") == vehicle_id and v.get("state") == "online":
-                    logger.info("Vehicle %d is now online", vehicle_id)
-                    return True
-
-        logger.warning("Vehicle %d did not wake within %ds", vehicle_id, max_wait)
+        for delay in self._WAKE_DELAYS:
+            time.sleep(delay)
+            elapsed += delay
+            vehicle = self.get_vehicle(vehicle_id)
+            if vehicle is not None and vehicle.get("state") == "online":
+                logger.info("Vehicle %d is now online", vehicle_id)
+                return True
+
+        logger.warning("Vehicle %d did not wake within %ds", vehicle_id, elapsed)
         return False